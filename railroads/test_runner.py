@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class KeepDBParallelRunner(DiscoverRunner):
+    """Reuse the test database and fan test cases out across CPUs.
+
+    Both defaults can still be overridden on the command line, e.g.
+    ``python manage.py test --parallel 1``. Tests always use a per-process
+    cache, so cached lists and throttle counters never leak between
+    workers or runs through a shared Redis, and the railway.W001 warning
+    about that per-process cache is silenced.
+    """
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(keepdb=True, parallel="auto")
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._local_caches = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem."
+                               "LocMemCache",
+                }
+            },
+            SILENCED_SYSTEM_CHECKS=[
+                *settings.SILENCED_SYSTEM_CHECKS, "railway.W001"
+            ],
+        )
+        self._local_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._local_caches.disable()
+        super().teardown_test_environment(**kwargs)
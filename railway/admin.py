@@ -18,10 +18,22 @@ class TicketInline(admin.TabularInline):
     extra = 1
 
 
+@admin.register(Train)
+class TrainAdmin(admin.ModelAdmin):
+    list_select_related = ("train_type",)
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_select_related = ("source", "destination")
+
+
+@admin.register(Journey)
+class JourneyAdmin(admin.ModelAdmin):
+    list_select_related = ("route__source", "route__destination")
+
+
 admin.site.register(Station)
 admin.site.register(TrainType)
 admin.site.register(Crew)
-admin.site.register(Train)
-admin.site.register(Route)
 admin.site.register(Order)
-admin.site.register(Journey)
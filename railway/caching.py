@@ -0,0 +1,88 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+LIST_CACHE_TIMEOUT = 300
+
+
+def _version_key(model: type[Model]) -> str:
+    return f"{model._meta.label_lower}:list-version"
+
+
+# Versions are seeded from the clock rather than 1, so a version lost to
+# a cache cull or restart never repeats one a client may still hold.
+def get_list_version(model: type[Model]) -> int:
+    return cache.get_or_set(_version_key(model), time.time_ns, timeout=None)
+
+
+def bump_list_version(model: type[Model]) -> None:
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), time.time_ns(), timeout=None)
+
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_list_cache(app_configs, **kwargs) -> list[checks.Warning]:
+    if settings.DEBUG:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        checks.Warning(
+            "Cached list ETags need a cache shared by every worker.",
+            hint="Set REDIS_URL so the default cache uses Redis.",
+            id="railway.W001",
+        )
+    ]
+
+
+def cache_list_response(view_method):
+    """Serve a list action from cache, answering If-None-Match with 304.
+
+    The ETag is derived from the model's list version, bumped by signals
+    whenever a row is saved or deleted, and the absolute request URI; the
+    cached pages carry absolute next/previous links for that host.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        model = self.queryset.model
+        etag = hashlib.blake2b(
+            f"{get_list_version(model)}:{request.build_absolute_uri()}"
+            .encode(),
+            digest_size=16,
+        ).hexdigest()
+        headers = {"ETag": f'"{etag}"'}
+        if headers["ETag"] in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers=headers
+            )
+
+        cache_key = f"{model._meta.label_lower}:list:{etag}"
+        data = cache.get(cache_key)
+        if data is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(cache_key, data, LIST_CACHE_TIMEOUT)
+        return Response(data, headers=headers)
+
+    return wrapper
@@ -2,18 +2,27 @@ import time
 
 from django.core.management import BaseCommand
 from django.db import connections
-from django.db import OperationalError
+from django.db.utils import OperationalError
 
 
 class Command(BaseCommand):
+    initial_delay = 0.1
+    max_delay = 5.0
+
     def handle(self, *args, **options):
+        connection = connections["default"]
+        delay = self.initial_delay
         while True:
             try:
-                _ = connections["default"]
+                connection.ensure_connection()
+            except OperationalError:
+                self.stdout.write(
+                    f"Waiting for connection... (retry in {delay:.1f}s)"
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+            else:
                 self.stdout.write(
                     self.style.SUCCESS("Successfully connected to PostgreSQL")
                 )
-                return 0
-            except OperationalError:
-                time.sleep(1)
-                self.stdout.write("Waiting for connection...")
+                return
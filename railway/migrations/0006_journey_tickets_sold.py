@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_sold_tickets(apps, schema_editor):
+    Journey = apps.get_model("railway", "Journey")
+    Ticket = apps.get_model("railway", "Ticket")
+    sold = (
+        Ticket.objects.filter(journey=OuterRef("pk"))
+        .values("journey")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Journey.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0005_train_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_sold_tickets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0006_journey_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["route", "departure_time"], name="railway_jou_route_i_78ce70_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["route", "arrival_time"], name="railway_jou_route_i_31bda3_idx"
+            ),
+        ),
+    ]
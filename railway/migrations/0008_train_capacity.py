@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:05
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0007_journey_route_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="train",
+            name="capacity",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("cargo_num"), "*", models.F("places_in_cargo")
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:32
+
+from django.db import migrations, models
+
+
+VALIDATE_TICKET_SEAT_SQL = """
+CREATE OR REPLACE FUNCTION railway_validate_ticket_seat() RETURNS trigger AS $$
+DECLARE
+    train_places_in_cargo integer;
+    train_cargo_num integer;
+BEGIN
+    SELECT train.places_in_cargo, train.cargo_num
+    INTO train_places_in_cargo, train_cargo_num
+    FROM railway_journey journey
+    JOIN railway_train train ON train.id = journey.train_id
+    WHERE journey.id = NEW.journey_id;
+
+    IF NEW.seat > train_places_in_cargo THEN
+        RAISE EXCEPTION 'seat must be in the range [1, %]', train_places_in_cargo
+            USING ERRCODE = 'check_violation';
+    END IF;
+    IF NEW.cargo > train_cargo_num THEN
+        RAISE EXCEPTION 'cargo must be in the range [1, %]', train_cargo_num
+            USING ERRCODE = 'check_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER railway_ticket_seat_check
+BEFORE INSERT OR UPDATE ON railway_ticket
+FOR EACH ROW EXECUTE FUNCTION railway_validate_ticket_seat();
+"""
+
+DROP_VALIDATE_TICKET_SEAT_SQL = """
+DROP TRIGGER IF EXISTS railway_ticket_seat_check ON railway_ticket;
+DROP FUNCTION IF EXISTS railway_validate_ticket_seat();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0008_train_capacity"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("seat__gte", 1)), name="ticket_seat_gte_1"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("cargo__gte", 1)), name="ticket_cargo_gte_1"
+            ),
+        ),
+        migrations.RunSQL(
+            VALIDATE_TICKET_SEAT_SQL,
+            reverse_sql=DROP_VALIDATE_TICKET_SEAT_SQL,
+        ),
+    ]
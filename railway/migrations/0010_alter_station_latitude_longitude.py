@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0009_ticket_seat_constraints"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="station",
+            name="latitude",
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name="station",
+            name="longitude",
+            field=models.FloatField(),
+        ),
+    ]
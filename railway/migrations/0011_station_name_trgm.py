@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-15 13:10
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0010_alter_station_latitude_longitude"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="station",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="railway_station_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
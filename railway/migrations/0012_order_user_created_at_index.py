@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0011_station_name_trgm"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "-created_at"], name="railway_ord_user_id_d554dc_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway", "0012_order_user_created_at_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="journey",
+            name="railway_jou_departu_0ec88b_idx",
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time"],
+                include=("route", "train", "arrival_time"),
+                name="railway_journey_upcoming_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 import pathlib
 from uuid import uuid4
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import F
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -11,8 +13,18 @@ from railroads import settings
 # Create your models here.
 class Station(models.Model):
     name = models.CharField(max_length=100, unique=True)
-    latitude = models.DecimalField(max_digits=9, decimal_places=6)
-    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        indexes = [
+            # Serves the journey list's name__icontains filters.
+            GinIndex(
+                fields=["name"],
+                name="railway_station_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -44,6 +56,11 @@ class Train(models.Model):
     name = models.CharField(max_length=100)
     cargo_num = models.IntegerField()
     places_in_cargo = models.IntegerField()
+    capacity = models.GeneratedField(
+        expression=F("cargo_num") * F("places_in_cargo"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     train_type = models.ForeignKey(
         TrainType, on_delete=models.PROTECT, related_name="trains"
     )
@@ -83,6 +100,9 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
 
 
 class Journey(models.Model):
@@ -99,10 +119,20 @@ class Journey(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, blank=True)
+    tickets_sold = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ("departure_time",)
-        indexes = [models.Index(fields=["departure_time"])]
+        indexes = [
+            # Covers the upcoming-journeys scan of the list endpoint.
+            models.Index(
+                fields=["departure_time"],
+                include=["route", "train", "arrival_time"],
+                name="railway_journey_upcoming_idx",
+            ),
+            models.Index(fields=["route", "departure_time"]),
+            models.Index(fields=["route", "arrival_time"]),
+        ]
 
     def __str__(self):
         return f"{self.route.source.name} -> {self.route.destination.name}"
@@ -122,6 +152,16 @@ class Ticket(models.Model):
 
     class Meta:
         unique_together = ("cargo", "seat", "journey")
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(seat__gte=1),
+                name="ticket_seat_gte_1",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(cargo__gte=1),
+                name="ticket_cargo_gte_1",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.journey.train.name} ({self.seat})"
@@ -149,25 +189,11 @@ class Ticket(models.Model):
             )
 
     def clean(self):
+        train = self.journey.train
         Ticket.validate_seat(
             self.seat,
             self.cargo,
-            self.journey.train.places_in_cargo,
-            self.journey.train.cargo_num,
+            train.places_in_cargo,
+            train.cargo_num,
             ValidationError,
         )
-
-    def save(
-        self,
-        force_insert=False,
-        force_update=False,
-        using=None,
-        update_fields=None,
-    ):
-        self.clean()
-        return super(Ticket, self).save(
-            force_insert=force_insert,
-            force_update=force_update,
-            using=using,
-            update_fields=update_fields,
-        )
@@ -1,13 +1,65 @@
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Count, Window
 from rest_framework.pagination import PageNumberPagination
 
 
-class OrdersAndJourneysPagination(PageNumberPagination):
+class WindowCountPaginator(Paginator):
+    """Fetch a page together with the total row count.
+
+    The count comes from a ``count(*) OVER ()`` column on the page query
+    itself instead of a separate ``SELECT COUNT(*)`` round trip.
+    """
+
+    total_alias = "_total_count"
+
+    def page(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        bottom = (number - 1) * self.per_page
+        rows = list(
+            self.object_list.annotate(
+                **{self.total_alias: Window(Count("*"))}
+            )[bottom:bottom + self.per_page]
+        )
+        if not rows:
+            if number > 1 or not self.allow_empty_first_page:
+                raise EmptyPage("That page contains no results")
+            self.count = 0
+            return self._get_page(rows, number, self)
+
+        self.count = self._pop_total(rows)
+        return self._get_page(rows, number, self)
+
+    def _pop_total(self, rows: list) -> int:
+        first = rows[0]
+        if isinstance(first, dict):
+            total = first[self.total_alias]
+            for row in rows:
+                del row[self.total_alias]
+        elif isinstance(first, tuple):
+            total = first[-1]
+            rows[:] = [row[:-1] for row in rows]
+        else:
+            total = getattr(first, self.total_alias)
+        return total
+
+
+class WindowCountPagination(PageNumberPagination):
+    django_paginator_class = WindowCountPaginator
+
+
+class OrdersAndJourneysPagination(WindowCountPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
 
 
-class ListsPagination(PageNumberPagination):
+class ListsPagination(WindowCountPagination):
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 100
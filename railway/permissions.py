@@ -3,11 +3,11 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 class AllowAnyListOnlyUserReadOnlyAdminAll(BasePermission):
     def has_permission(self, request, view):
-        return bool(
-            view.action == "list"
-            or request.user and (
-                request.user.is_authenticated
-                and request.method in SAFE_METHODS
-            )
-            or request.user.is_staff
-        )
+        if view.action == "list":
+            return True
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_staff:
+            return True
+        return request.method in SAFE_METHODS
@@ -1,7 +1,13 @@
-from datetime import datetime
-
-from django.db import transaction
-from django.db.models import Count, F
+import copy
+import logging
+from collections import Counter
+from collections.abc import Mapping
+from itertools import chain
+from operator import attrgetter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
@@ -16,6 +22,24 @@ from railway.models import (
     TrainType
 )
 
+logger = logging.getLogger(__name__)
+
+
+class CachedFieldsMixin:
+    """Build a ModelSerializer's fields once per class.
+
+    Model introspection runs on the first instantiation; every instance
+    then gets a deep copy, the same way DRF copies declared fields.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get("_cached_fields")
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
+
 
 class StationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -23,7 +47,7 @@ class StationSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "latitude", "longitude")
 
 
-class StationListSerializer(StationSerializer):
+class StationListSerializer(CachedFieldsMixin, StationSerializer):
     class Meta:
         model = Station
         fields = ("id", "name")
@@ -35,7 +59,7 @@ class RouteSerializer(serializers.ModelSerializer):
         fields = ("id", "source", "destination", "distance")
 
 
-class RouteListSerializer(RouteSerializer):
+class RouteListSerializer(CachedFieldsMixin, RouteSerializer):
     source = serializers.CharField(
         source="source.name",
         read_only=True,
@@ -58,7 +82,7 @@ class TrainSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "train_type", "cargo_num", "places_in_cargo")
 
 
-class TrainListSerializer(TrainSerializer):
+class TrainListSerializer(CachedFieldsMixin, TrainSerializer):
     train_type = serializers.SlugRelatedField(
         many=False,
         read_only=True,
@@ -89,10 +113,10 @@ class TrainJourneySerializer(TrainSerializer):
         fields = ("id", "name", "cargo_num", "places_in_cargo")
 
 
-class JourneySerializer(serializers.ModelSerializer):
+class JourneySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     route = serializers.PrimaryKeyRelatedField(
         many=False,
-        queryset=Route.objects.select_related("source", "destination"),
+        queryset=Route.objects.only("id"),
         read_only=False,
     )
 
@@ -116,8 +140,10 @@ class JourneyUpcomingSerializer(JourneySerializer):
         fields = ("id", "departure_time", "arrival_time", "available_tickets")
 
 
-class JourneyListSerializer(serializers.ModelSerializer):
-    route = serializers.StringRelatedField(many=False, read_only=False)
+class JourneyListSerializer(
+    CachedFieldsMixin, serializers.ModelSerializer
+):
+    route = serializers.StringRelatedField(many=False, read_only=True)
     train = serializers.SlugRelatedField(
         many=False,
         read_only=True,
@@ -153,20 +179,15 @@ class RouteRetrieveSerializer(RouteSerializer):
         model = Route
         fields = RouteListSerializer.Meta.fields + ("upcoming_journeys",)
 
-    @staticmethod
     @extend_schema_field(JourneyUpcomingSerializer(many=True))
-    def get_upcoming_journeys(obj):
+    def get_upcoming_journeys(self, obj):
         journeys = (
             Journey.objects.filter(
-                departure_time__gte=datetime.now(),
+                departure_time__gte=self.context.get("now", timezone.now()),
                 route_id=obj.id
             ).order_by("departure_time")
-            .select_related("train")
             .annotate(
-                available_tickets=(
-                    F("train__cargo_num") * F("train__places_in_cargo")
-                    - Count("tickets")
-                )
+                available_tickets=F("train__capacity") - F("tickets_sold")
             )
         )
         return JourneyUpcomingSerializer(journeys, many=True).data
@@ -175,11 +196,14 @@ class RouteRetrieveSerializer(RouteSerializer):
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs)
+        journey = self.context.get("journeys", {}).get(
+            attrs["journey"].pk, attrs["journey"]
+        )
         Ticket.validate_seat(
             attrs["seat"],
             attrs["cargo"],
-            attrs["journey"].train.places_in_cargo,
-            attrs["journey"].train.cargo_num,
+            journey.train.places_in_cargo,
+            journey.train.cargo_num,
             serializers.ValidationError,
         )
         return data
@@ -204,17 +228,62 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ("id", "created_at", "tickets")
 
+    def to_internal_value(self, data):
+        tickets = data.get("tickets") if isinstance(data, Mapping) else None
+        if isinstance(tickets, list):
+            journey_pks = set()
+            for ticket in tickets:
+                if not isinstance(ticket, Mapping):
+                    continue
+                try:
+                    journey_pks.add(int(str(ticket.get("journey", ""))))
+                except ValueError:
+                    # Left for PrimaryKeyRelatedField to reject.
+                    continue
+            self.context["journeys"] = (
+                Journey.objects.select_related("train").in_bulk(journey_pks)
+            )
+        return super().to_internal_value(data)
+
     def create(self, validated_data):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            try:
+                Ticket.objects.bulk_create(
+                    [
+                        Ticket(order=order, **ticket_data)
+                        for ticket_data in tickets_data
+                    ],
+                    batch_size=500,
+                )
+            except IntegrityError as error:
+                logger.info(
+                    "Ticket insert rejected for order %s: %s", order.pk, error
+                )
+                raise serializers.ValidationError(
+                    {
+                        "tickets": "Seat already taken or out of range "
+                                   "for this journey."
+                    }
+                )
+            sold = Counter(
+                ticket_data["journey"].pk for ticket_data in tickets_data
+            )
+            for journey_id, count in sold.items():
+                Journey.objects.filter(pk=journey_id).update(
+                    tickets_sold=F("tickets_sold") + count
+                )
             return order
 
 
-class OrderListSerializer(OrderSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+class OrderListSerializer(CachedFieldsMixin, OrderSerializer):
+    tickets = serializers.SerializerMethodField(read_only=True)
+
+    @staticmethod
+    @extend_schema_field(TicketListSerializer(many=True))
+    def get_tickets(obj):
+        return obj.tickets_json
 
 
 class JourneyOutStationSerializer(JourneySerializer):
@@ -252,37 +321,22 @@ class StationRetrieveSerializer(StationListSerializer):
     @staticmethod
     @extend_schema_field(JourneyOutStationSerializer(many=True))
     def get_outgoing_journeys(obj):
-        journeys = (
-            Journey.objects.filter(
-                arrival_time__gte=datetime.now(), route__source__name=obj
-            )
-            .select_related("route", "route__destination")
-            .order_by("departure_time")
-            .annotate(
-                available_tickets=(
-                    F("train__cargo_num") * F("train__places_in_cargo")
-                    - Count("tickets")
-                )
-            )
+        journeys = sorted(
+            chain.from_iterable(
+                route.upcoming_out for route in obj.outgoing_routes.all()
+            ),
+            key=attrgetter("departure_time"),
         )
         return JourneyOutStationSerializer(journeys, many=True).data
 
     @staticmethod
     @extend_schema_field(JourneyInStationSerializer(many=True))
     def get_incoming_journeys(obj):
-        journeys = (
-            Journey.objects.filter(
-                departure_time__gte=datetime.now(),
-                route__destination__name=obj
-            )
-            .select_related("route", "route__source")
-            .order_by("arrival_time")
-            .annotate(
-                available_tickets=(
-                    F("train__cargo_num") * F("train__places_in_cargo")
-                    - Count("tickets")
-                )
-            )
+        journeys = sorted(
+            chain.from_iterable(
+                route.upcoming_in for route in obj.incoming_routes.all()
+            ),
+            key=attrgetter("arrival_time"),
         )
         return JourneyInStationSerializer(journeys, many=True).data
 
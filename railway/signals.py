@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from railway.caching import bump_list_version
+from railway.models import Journey, Route, Station, Ticket, Train, TrainType
+
+# Cached lists to invalidate when a row of the sender changes; route and
+# train lists render station and train type names.
+CACHED_LIST_DEPENDENTS = {
+    Station: (Station, Route),
+    Route: (Route,),
+    TrainType: (TrainType, Train),
+    Train: (Train,),
+}
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_journey(
+    sender, instance: Ticket, update_fields=None, **kwargs
+) -> None:
+    instance._previous_journey_id = None
+    if instance._state.adding:
+        return
+    if update_fields is None or "journey" in update_fields:
+        instance._previous_journey_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("journey_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def increment_tickets_sold(
+    sender, instance: Ticket, created: bool, **kwargs
+) -> None:
+    previous_journey_id = instance._previous_journey_id
+    if not created and previous_journey_id in (None, instance.journey_id):
+        return
+    if previous_journey_id is not None:
+        # Moved to another journey: release the seat on the old one.
+        Journey.objects.filter(pk=previous_journey_id).update(
+            tickets_sold=F("tickets_sold") - 1
+        )
+    Journey.objects.filter(pk=instance.journey_id).update(
+        tickets_sold=F("tickets_sold") + 1
+    )
+
+
+@receiver(post_delete, sender=Ticket)
+def decrement_tickets_sold(sender, instance: Ticket, **kwargs) -> None:
+    Journey.objects.filter(pk=instance.journey_id).update(
+        tickets_sold=F("tickets_sold") - 1
+    )
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=TrainType)
+@receiver(post_delete, sender=TrainType)
+@receiver(post_save, sender=Train)
+@receiver(post_delete, sender=Train)
+def invalidate_cached_lists(sender, **kwargs) -> None:
+    # Bump after commit: a list cached while the write is still pending
+    # would otherwise store the old rows under the new version.
+    def bump() -> None:
+        for model in CACHED_LIST_DEPENDENTS[sender]:
+            bump_list_version(model)
+
+    transaction.on_commit(bump)
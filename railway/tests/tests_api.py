@@ -1,9 +1,10 @@
-import tempfile
 import os
+import shutil
+import tempfile
 
-from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework.test import APIClient
@@ -15,6 +16,18 @@ from railway.models import (
 )
 
 TRAIN_URL = reverse("railway:train-list")
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+# 1x1 GIF; Pillow on the server side still decodes and verifies it.
+IMAGE_BYTES = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff"
+    b"!\xf9\x04\x01\x00\x00\x00\x00"
+    b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+
+def sample_image() -> SimpleUploadedFile:
+    return SimpleUploadedFile(
+        "sample.gif", IMAGE_BYTES, content_type="image/gif"
+    )
 
 def image_upload_url(train_id):
     """Return URL for recipe image upload"""
@@ -24,103 +37,64 @@ def detail_url(train_id):
     return reverse("railway:train-detail", args=[train_id])
 
 
-class TrainAnonImageUploadTest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.train_type = TrainType.objects.create(name="Sample TrainType")
-        self.train = Train.objects.create(
-            name="Sample train",
-            cargo_num=10,
-            places_in_cargo=20,
-            train_type=self.train_type
-        )
-
-    def tearDown(self):
-        self.train.image.delete()
+class TemporaryMediaRootMixin:
+    """Give each test class its own MEDIA_ROOT, safe under --parallel."""
 
-    def test_upload_image_to_train(self):
-        url = image_upload_url(self.train.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                url,
-                {"image": ntf},
-                format="multipart"
-            )
-        self.train.refresh_from_db()
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        cls.addClassCleanup(media_override.disable)
+        super().setUpClass()
 
-        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
+@override_settings(PASSWORD_HASHERS=PASSWORD_HASHERS)
+class TrainImageUploadTests(TemporaryMediaRootMixin, TestCase):
+    client_class = APIClient
 
-class TrainAuthenticatedImageUploadTest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        cls.regular_user = get_user_model().objects.create_user(
             email="user@example.ie",
             password="user-password"
         )
-        self.client.force_authenticate(user=self.user)
-        self.train_type = TrainType.objects.create(name="Sample TrainType")
-        self.train = Train.objects.create(
+        cls.train_type = TrainType.objects.create(name="Sample TrainType")
+        cls.train = Train.objects.create(
             name="Sample train",
             cargo_num=10,
             places_in_cargo=20,
-            train_type=self.train_type
+            train_type=cls.train_type
         )
 
-    def tearDown(self):
-        self.train.image.delete()
-
-    def test_upload_image_to_train(self):
-        url = image_upload_url(self.train.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                url,
-                {"image": ntf},
-                format="multipart"
-            )
-        self.train.refresh_from_db()
-
-        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
-
-
-class TrainImageUploadTests(TestCase):
     def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_superuser(
-            "admin@myproject.com", "password"
-        )
         self.client.force_authenticate(self.user)
-        self.train_type = TrainType.objects.create(name="Sample TrainType")
-        self.train = Train.objects.create(
-            name="Sample train",
-            cargo_num=10,
-            places_in_cargo=20,
-            train_type=self.train_type
-        )
 
     def tearDown(self):
         self.train.image.delete()
 
     def test_upload_image_to_train(self):
         url = image_upload_url(self.train.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                url,
-                {"image": ntf},
-                format="multipart"
-            )
-        self.train.refresh_from_db()
+        cases = (
+            (None, status.HTTP_401_UNAUTHORIZED),
+            (self.regular_user, status.HTTP_403_FORBIDDEN),
+            (self.user, status.HTTP_200_OK),
+        )
+        for user, expected_status in cases:
+            with self.subTest(user=user):
+                self.client.force_authenticate(user=user)
+                res = self.client.post(
+                    url,
+                    {"image": sample_image()},
+                    format="multipart"
+                )
+                self.assertEqual(res.status_code, expected_status)
 
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.train.refresh_from_db()
         self.assertIn("image", res.data)
         self.assertTrue(os.path.exists(self.train.image.path))
 
@@ -133,33 +107,34 @@ class TrainImageUploadTests(TestCase):
         )
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_upload_image_to_missing_train(self):
+        url = image_upload_url(self.train.id + 1)
+        res = self.client.post(
+            url,
+            {"image": sample_image()},
+            format="multipart"
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_post_image_to_train_list(self):
         url = TRAIN_URL
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            res = self.client.post(
-                url,
-                {
-                    "name": "Test",
-                    "cargo_num": 10,
-                    "places_in_cargo": 15,
-                    "train_type": self.train_type.id,
-                    "image": ntf,
-                },
-                format="multipart",
-            )
+        res = self.client.post(
+            url,
+            {
+                "name": "Test",
+                "cargo_num": 10,
+                "places_in_cargo": 15,
+                "train_type": self.train_type.id,
+                "image": sample_image(),
+            },
+            format="multipart",
+        )
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         train = Train.objects.get(pk=res.data["id"])
         self.assertFalse(train.image)
 
     def test_image_url_is_shown_on_train_detail(self):
         url = image_upload_url(self.train.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
-            img = Image.new("RGB", (10, 10))
-            img.save(ntf, format="JPEG")
-            ntf.seek(0)
-            self.client.post(url, {"image": ntf}, format="multipart")
+        self.client.post(url, {"image": sample_image()}, format="multipart")
         res = self.client.get(detail_url(self.train.id))
         self.assertIn("image", res.data)
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from railway.models import Order, Ticket
+from railway.tests.tests_view_sets import (
+    UNUSABLE_PASSWORD,
+    sample_journey,
+    sample_train,
+)
+
+
+class TicketDatabaseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.journey = sample_journey(
+            train=sample_train(cargo_num=2, places_in_cargo=3)
+        )
+        cls.order = Order.objects.create(
+            user=get_user_model().objects.create(
+                email="test.user@example.ie",
+                password=UNUSABLE_PASSWORD,
+            )
+        )
+
+    def test_tickets_sold_follows_ticket_create_and_delete(self):
+        ticket = Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=self.order
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 1)
+
+        ticket.delete()
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 0)
+
+    def test_tickets_sold_follows_ticket_journey_change(self):
+        other_journey = sample_journey(train=self.journey.train)
+        ticket = Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=self.order
+        )
+
+        ticket.journey = other_journey
+        ticket.save()
+        self.journey.refresh_from_db()
+        other_journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 0)
+        self.assertEqual(other_journey.tickets_sold, 1)
+
+        ticket.seat = 2
+        ticket.save()
+        other_journey.refresh_from_db()
+        self.assertEqual(other_journey.tickets_sold, 1)
+
+    def test_out_of_range_seat_rejected_by_database(self):
+        scenarios = {
+            "seat_below_one": {"cargo": 1, "seat": 0},
+            "cargo_below_one": {"cargo": 0, "seat": 1},
+            "seat_above_train": {"cargo": 1, "seat": 4},
+            "cargo_above_train": {"cargo": 3, "seat": 1},
+        }
+        for name, seat in scenarios.items():
+            with self.subTest(name):
+                with self.assertRaises(IntegrityError):
+                    with transaction.atomic():
+                        Ticket.objects.create(
+                            journey=self.journey, order=self.order, **seat
+                        )
+        self.assertFalse(Ticket.objects.exists())
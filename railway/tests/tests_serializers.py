@@ -0,0 +1,53 @@
+from django.test import SimpleTestCase
+
+from railway.serializers import (
+    JourneySerializer,
+    JourneyListSerializer,
+    JourneyRetrieveSerializer,
+)
+
+
+class JourneySerializerFieldsTests(SimpleTestCase):
+    def test_journey_serializer_fields(self):
+        self.assertEqual(
+            JourneySerializer.Meta.fields,
+            (
+                "id",
+                "route",
+                "train",
+                "departure_time",
+                "arrival_time",
+                "crew"
+            )
+        )
+
+    def test_journey_list_serializer_fields(self):
+        self.assertEqual(
+            JourneyListSerializer.Meta.fields,
+            (
+                "id",
+                "route",
+                "train",
+                "departure_time",
+                "arrival_time",
+                "available_tickets",
+            )
+        )
+        self.assertEqual(
+            JourneyRetrieveSerializer.Meta.fields,
+            JourneyListSerializer.Meta.fields + ("crew",)
+        )
+
+
+class CachedFieldsTests(SimpleTestCase):
+    def test_instances_get_their_own_fields(self):
+        first = JourneyListSerializer().fields
+        second = JourneyListSerializer().fields
+
+        self.assertEqual(list(first), list(second))
+        for name in first:
+            self.assertIsNot(first[name], second[name])
+
+    def test_subclass_builds_its_own_fields(self):
+        JourneyListSerializer().fields
+        self.assertIn("crew", JourneyRetrieveSerializer().fields)
@@ -1,8 +1,14 @@
 from datetime import timedelta
-from uuid import uuid4
+from functools import lru_cache
+from itertools import count
 
 from django.contrib.auth import get_user_model
-from django.db.models import Count, F
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -17,51 +23,96 @@ from railway.models import (
     Train,
     TrainType,
     Route,
-    Journey
+    Journey,
+    Order
 )
 from railway.serializers import JourneyListSerializer
+from railway.views import start_of_day
+
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+# The API authenticates with JWT only, so these tests need no session,
+# CSRF or message middleware around the views.
+API_MIDDLEWARE = []
+# Tests authenticate with force_authenticate, so no password is checked.
+UNUSABLE_PASSWORD = make_password(None)
+NAME_SUFFIXES = count()
+LIST_URLS = {
+    name: reverse(f"railway:{name}-list")
+    for name in (
+        "station", "train", "route", "journey", "crew", "traintype", "order"
+    )
+}
 
-
-def sample_station(name="Station", **params) -> Station:
+def sample_station(name="Station", commit=True, **params) -> Station:
     defaults = {
-        "name": f"{name}_{uuid4()}",
-        "latitude": "0.000000",
-        "longitude": "0.000000",
+        "name": f"{name}_{next(NAME_SUFFIXES)}",
+        "latitude": 0.0,
+        "longitude": 0.0,
     }
     defaults.update(params)
-    return Station.objects.create(**defaults)
+    station = Station(**defaults)
+    if commit:
+        station.save()
+    return station
+
+def sample_stations(number, name="Station", **params) -> list[Station]:
+    return Station.objects.bulk_create(
+        [
+            sample_station(name=name, commit=False, **params)
+            for _ in range(number)
+        ]
+    )
 
-def sample_train(name="Train", **params) -> Train:
+def sample_train(
+    name="Train", train_type=None, commit=True, **params
+) -> Train:
     defaults = {
-        "name": f"{name}_{uuid4()}",
+        "name": f"{name}_{next(NAME_SUFFIXES)}",
         "cargo_num": 10,
         "places_in_cargo": 10,
-        "train_type": TrainType.objects.create(name="TestType"),
+        "train_type": (
+            train_type
+            or TrainType.objects.get_or_create(name="TestType")[0]
+        ),
     }
     defaults.update(params)
-    return Train.objects.create(**defaults)
+    train = Train(**defaults)
+    if commit:
+        train.save()
+    return train
 
-def sample_route(**params) -> Route:
+def sample_route(commit=True, **params) -> Route:
     defaults = {
         "source": sample_station(name="Source"),
         "destination": sample_station(name="Destination"),
         "distance": 10,
     }
     defaults.update(params)
-    return Route.objects.create(**defaults)
-
-def sample_journey(route=None, train=None, **params):
+    route = Route(**defaults)
+    if commit:
+        route.save()
+    return route
+
+def sample_journey(
+    route=None, train=None, commit=True, *, now=None, **params
+):
     route = route or sample_route()
     train = train or sample_train()
+    now = now or timezone.now()
     defaults = {
         "route": route,
         "train": train,
-        "departure_time": timezone.now() + timedelta(minutes=1),
-        "arrival_time": timezone.now() + timedelta(hours=1),
+        "departure_time": now + timedelta(minutes=1),
+        "arrival_time": now + timedelta(hours=1),
     }
     defaults.update(params)
-    return Journey.objects.create(**defaults)
+    journey = Journey(**defaults)
+    if commit:
+        journey.save()
+    return journey
 
+@lru_cache(maxsize=None)
 def detail_url(instance_type: str, instance_id: int) -> str:
     return reverse(
         f"railway:{instance_type}-detail",
@@ -69,29 +120,45 @@ def detail_url(instance_type: str, instance_id: int) -> str:
     )
 
 
+# Keep these on TestCase: a TransactionTestCase flushes every table
+# after each test instead of rolling back, and drops setUpTestData.
+@override_settings(
+    PASSWORD_HASHERS=PASSWORD_HASHERS, MIDDLEWARE=API_MIDDLEWARE
+)
 class BaseRailwayTest(APITestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.station = sample_station()
-        self.route = sample_route()
-        self.train = sample_train()
-        self.crew = Crew.objects.create(
+    user = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.traintype = TrainType.objects.create(name="TestType")
+        cls.station = sample_station()
+        cls.route = sample_route()
+        cls.train = sample_train(train_type=cls.traintype)
+        cls.crew = Crew.objects.create(
             first_name="Test",
             last_name="Test",
             position="Tester"
         )
-        self.traintype = TrainType.objects.create(name="TestType")
+        cls.journey = sample_journey(route=cls.route, train=cls.train)
+
+    def setUp(self):
+        super().setUp()
+        # The list cache is not rolled back with the test transaction.
+        cache.clear()
+        if self.user is not None:
+            self.client.force_authenticate(user=self.user)
 
 
 class UnauthorizedRailwayTests(BaseRailwayTest):
     def test_lists_unauthorized(self):
-        for endpoint in ["station", "train", "route", "journey"]:
-            res = self.client.get(reverse(f"railway:{endpoint}-list"))
-            self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(LIST_URLS["station"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        for endpoint in ["crew", "traintype", "order"]:
-            res = self.client.get(reverse(f"railway:{endpoint}-list"))
-            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        for endpoint in ["train", "route", "journey"]:
+            with self.subTest(endpoint=endpoint):
+                with self.assertNumQueries(1):
+                    res = self.client.get(LIST_URLS[endpoint])
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
 
     def test_unauthorized_retrieve_denied(self):
         objects_to_check = {
@@ -100,36 +167,109 @@ class UnauthorizedRailwayTests(BaseRailwayTest):
             "train": self.train,
             "crew": self.crew,
             "traintype": self.traintype,
-            "journey": sample_journey(),
+            "journey": self.journey,
         }
         for key, instance in objects_to_check.items():
-            url = detail_url(key, instance.id)
-            res = self.client.get(url)
-            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
-
-    def test_unauthorized_station_create_denied(self):
-        payload = {"name": "AnonTest", "latitude": 1, "longitude": 1}
-        res = self.client.post(reverse("railway:station-list"), payload)
-        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            with self.subTest(endpoint=key):
+                res = self.client.get(detail_url(key, instance.id))
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_401_UNAUTHORIZED
+                )
+
+    def test_station_list_not_modified(self):
+        url = LIST_URLS["station"]
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
 
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_station()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-class AuthorizedRailwayTests(BaseRailwayTest):
-    def setUp(self):
-        super().setUp()
-        self.user = get_user_model().objects.create_user(
-            email="test.user@example.ie",
-            password="password.test.user",
+    def test_reference_lists_served_without_queries(self):
+        for endpoint in ["station", "route"]:
+            with self.subTest(endpoint=endpoint):
+                etag = self.client.get(LIST_URLS[endpoint])["ETag"]
+                with self.assertNumQueries(0):
+                    res = self.client.get(LIST_URLS[endpoint])
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                with self.assertNumQueries(0):
+                    res = self.client.get(
+                        LIST_URLS[endpoint], HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_304_NOT_MODIFIED
+                )
+
+    def test_route_list_modified_by_station_rename(self):
+        url = LIST_URLS["route"]
+        etag = self.client.get(url)["ETag"]
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.route.source.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.route.source.save()
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            # Not bumped until the write commits.
+            self.assertEqual(
+                res.status_code,
+                status.HTTP_304_NOT_MODIFIED
+            )
+        self.assertEqual(len(callbacks), 1)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "Renamed",
+            [route["source"] for route in res.data["results"]]
         )
-        self.client.force_authenticate(user=self.user)
 
-    def test_lists_authorized(self):
-        for endpoint in ["crew", "traintype"]:
-            res = self.client.get(reverse(f"railway:{endpoint}-list"))
-            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
-        res = self.client.get(reverse(f"railway:order-list"))
+    def test_train_list_modified_by_train_type_rename(self):
+        url = LIST_URLS["train"]
+        etag = self.client.get(url)["ETag"]
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.traintype.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.traintype.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "Renamed",
+            [train["train_type"] for train in res.data]
+        )
+
+
+@override_settings(MIDDLEWARE=API_MIDDLEWARE)
+class PermissionDeniedTests(SimpleTestCase):
+    """Requests rejected by permissions, before any row is looked up."""
+
+    client_class = APIClient
+
+    def test_lists_unauthorized_denied(self):
+        for endpoint in ["crew", "traintype", "order"]:
+            with self.subTest(endpoint=endpoint):
+                res = self.client.get(LIST_URLS[endpoint])
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_401_UNAUTHORIZED
+                )
 
-    def test_authorized_station_create_forbidden(self):
+    def test_unauthorized_station_create_denied(self):
+        payload = {"name": "AnonTest", "latitude": 1, "longitude": 1}
+        res = self.client.post(LIST_URLS["station"], payload)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_authorized_create_forbidden(self):
+        self.client.force_authenticate(
+            user=get_user_model()(email="test.user@example.ie")
+        )
+        now = timezone.now()
         scenarios = [
             (
                 "station",
@@ -141,11 +281,7 @@ class AuthorizedRailwayTests(BaseRailwayTest):
             ),
             (
                 "route",
-                {
-                    "source": self.station.id,
-                    "destination": sample_station().id,
-                    "distance": 10
-                }
+                {"source": 1, "destination": 2, "distance": 10}
             ),
             (
                 "crew",
@@ -160,7 +296,7 @@ class AuthorizedRailwayTests(BaseRailwayTest):
                 "train",
                 {
                     "name": "TrainTest",
-                    "train_type": self.traintype.id,
+                    "train_type": 1,
                     "cargo_num": 8,
                     "places_in_cargo": 15
                 }
@@ -168,156 +304,128 @@ class AuthorizedRailwayTests(BaseRailwayTest):
             (
                 "journey",
                 {
-                    "route": self.route.id,
-                    "train": self.train.id,
-                    "departure_time": timezone.now() + timedelta(minutes=1),
-                    "arrival_time": timezone.now() + timedelta(hours=1),
+                    "route": 1,
+                    "train": 1,
+                    "departure_time": now + timedelta(minutes=1),
+                    "arrival_time": now + timedelta(hours=1),
                 }
             )
         ]
 
         for endpoint, payload in scenarios:
-            res = self.client.post(
-                reverse(
-                    f"railway:{endpoint}-list"),
+            with self.subTest(endpoint=endpoint):
+                res = self.client.post(
+                    LIST_URLS[endpoint],
                     payload,
                     format="json"
-            )
-            self.assertEqual(
-                res.status_code,
-                status.HTTP_403_FORBIDDEN,
-                f"Failed on {endpoint}"
-            )
+                )
+                self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AuthorizedRailwayTests(BaseRailwayTest):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user, cls.other_user = get_user_model().objects.bulk_create(
+            [
+                get_user_model()(
+                    email="test.user@example.ie",
+                    password=UNUSABLE_PASSWORD,
+                ),
+                get_user_model()(
+                    email="test_1.user@example.ie",
+                    password=UNUSABLE_PASSWORD,
+                ),
+            ]
+        )
+
+    def test_lists_authorized(self):
+        for endpoint in ["crew", "traintype"]:
+            with self.subTest(endpoint=endpoint):
+                res = self.client.get(LIST_URLS[endpoint])
+                self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        res = self.client.get(LIST_URLS["order"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_authorized_orders_newest_first(self):
+        older, newer = Order.objects.bulk_create(
+            [Order(user=self.user), Order(user=self.user)]
+        )
+        Order.objects.filter(pk=older.pk).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        res = self.client.get(LIST_URLS["order"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]],
+            [newer.id, older.id]
+        )
 
     def test_authorized_order_create_success(self):
-        journey = sample_journey()
         payload = {
             "tickets": [
                 {
                     "cargo": 7,
                     "seat": 5,
-                    "journey": journey.id
+                    "journey": self.journey.id
                 }
             ]
         }
         res = self.client.post(
-            reverse("railway:order-list"),
+            LIST_URLS["order"],
             payload,
             format="json"
         )
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 1)
 
-    def test_journey_list(self):
-        journey_1 = sample_journey()
-        tomorrow = timezone.now() + timedelta(days=1)
-        journey_2 = sample_journey(
-            route=self.route,
-            train=self.train,
-            departure_time=tomorrow,
-            arrival_time=tomorrow + timedelta(hours=1),
-        )
-        train = sample_train(name="Test")
-        route = sample_route()
-        next_week = timezone.now() + timedelta(days=7)
-        journey_3 = sample_journey(
-            train=train,
-            route=route,
-            departure_time=next_week,
-            arrival_time=next_week + timedelta(hours=1),
-        )
-        yesterday = timezone.now() - timedelta(days=1)
-        journey_expired = sample_journey(
-            train=sample_train(),
-            route=sample_route(),
-            departure_time=yesterday,
-            arrival_time=yesterday + timedelta(hours=1),
-        )
-        journeys = Journey.objects.all().annotate(
-            available_tickets=(
-                F("train__cargo_num") * F("train__places_in_cargo")
-                - Count("tickets")
-            )
+        res = self.client.get(LIST_URLS["order"])
+        (ticket,) = res.data["results"][0]["tickets"]
+        self.assertEqual(list(ticket), ["cargo", "seat", "journey"])
+        self.assertEqual(
+            ticket,
+            {"cargo": 7, "seat": 5, "journey": str(self.journey.route)}
         )
 
-        serializer = JourneyListSerializer(journeys, many=True)
-        res = self.client.get(reverse("railway:journey-list"))
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        ids = [item["id"] for item in res.data["results"]]
-        self.assertIn(journey_1.id, ids)
-        self.assertIn(journey_2.id, ids)
-        self.assertIn(journey_3.id, ids)
-        self.assertNotIn(journey_expired, ids)
-        self.assertIn(serializer.data[0], res.data["results"])
-
-        res = self.client.get(
-            reverse("railway:journey-list"),
-            {
-                "date": str(tomorrow.date())
-            }
-        )
-        ids = [item["id"] for item in res.data["results"]]
-        self.assertIn(journey_2.id, ids)
-        self.assertIn(journey_3.id, ids)
-        self.assertNotIn(journey_1, ids)
-
-        res = self.client.get(
-            reverse("railway:journey-list"),
-            {
-                "destination": route.destination.name
-            }
-        )
-        ids = [item["id"] for item in res.data["results"]]
-        self.assertIn(journey_3.id, ids)
-        self.assertNotIn(journey_1.id, ids)
-
-        res = self.client.get(
-            reverse("railway:journey-list"),
-            {
-                "source": self.route.source.name
-            }
-        )
-        ids = [item["id"] for item in res.data["results"]]
-        self.assertIn(journey_2.id, ids)
-        self.assertNotIn(journey_3.id, ids)
+    def test_authorized_order_non_decimal_journey_rejected(self):
+        payload = {"tickets": [{"cargo": 1, "seat": 1, "journey": "²"}]}
+        res = self.client.post(LIST_URLS["order"], payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_authorized_only_users_orders(self):
-        user_1 = get_user_model().objects.create_user(
-            email="test_1.user@example.ie",
-            password="password.test_1.user",
-        )
         client_1 = APIClient()
-        client_1.force_authenticate(user=user_1)
+        client_1.force_authenticate(user=self.other_user)
         payload_1 = {
             "tickets": [
                 {
                     "cargo": 3,
                     "seat": 2,
-                    "journey": sample_journey().id
+                    "journey": self.journey.id
                 }
             ]
         }
         payload_2 = {
             "tickets": [
                 {
-                    "cargo": 3,
-                    "seat": 2,
-                    "journey": sample_journey().id
+                    "cargo": 4,
+                    "seat": 3,
+                    "journey": self.journey.id
                 }
             ]
         }
         res_1 = client_1.post(
-            reverse("railway:order-list"),
+            LIST_URLS["order"],
             payload_1,
             format="json"
         )
         res_2 = self.client.post(
-            reverse("railway:order-list"),
+            LIST_URLS["order"],
             payload_2,
             format="json"
         )
         res_3 = self.client.post(
-            reverse("railway:order-list"),
+            LIST_URLS["order"],
             payload_2,
             format="json"
         )
@@ -337,11 +445,14 @@ class AuthorizedRailwayTests(BaseRailwayTest):
         self.assertEqual(res.data["longitude"], self.station.longitude)
 
     def test_authorized_retrieve_journey(self):
-        journey = sample_journey()
-        url = detail_url("journey", journey.id)
-        res = self.client.get(url)
+        self.journey.crew.add(self.crew)
+        url = detail_url("journey", self.journey.id)
+        # journey with its train and stations, then its crew
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(journey.id, res.data["id"])
+        self.assertEqual(self.journey.id, res.data["id"])
+        self.assertEqual(res.data["crew"], [str(self.crew)])
 
     def test_authorized_retrieve_route(self):
         url = detail_url("route", self.route.id)
@@ -372,7 +483,9 @@ class AuthorizedRailwayTests(BaseRailwayTest):
         # Check Station detail
         # (must contain "outgoing_journeys" and "incoming_journeys" fields)
         url_station = detail_url("station", self.station.id)
-        res_station = self.client.get(url_station)
+        # station, then routes and journeys for each direction
+        with self.assertNumQueries(5):
+            res_station = self.client.get(url_station)
         self.assertIsInstance(res_station.data["outgoing_journeys"], list)
         self.assertIsInstance(res_station.data["incoming_journeys"], list)
         outgoing_ids = [journey["id"] for journey in
@@ -401,7 +514,8 @@ class AuthorizedRailwayTests(BaseRailwayTest):
 
         # Check Route detail (must contain "incoming_journeys" field)
         url_route = detail_url("route", route_outgoing.id)
-        res_route = self.client.get(url_route)
+        with self.assertNumQueries(2):
+            res_route = self.client.get(url_route)
         self.assertIsInstance(res_station.data["outgoing_journeys"], list)
         self.assertIsInstance(res_station.data["incoming_journeys"], list)
         upcoming_ids = [journey["id"] for journey in
@@ -410,30 +524,203 @@ class AuthorizedRailwayTests(BaseRailwayTest):
 
     def test_authorized_update_delete_forbidden(self):
         test_dict = {
-            "station": sample_station().id,
-            "route": sample_route().id,
-            "journey": sample_journey().id,
-            "train": sample_train().id,
+            "station": self.station.id,
+            "route": self.route.id,
+            "journey": self.journey.id,
+            "train": self.train.id,
         }
         for key, instance_id in test_dict.items():
             url = detail_url(key, instance_id)
-            res_put = self.client.put(url, {})
-            res_patch = self.client.patch(url, {})
-            res_del = self.client.delete(url)
-            self.assertEqual(res_put.status_code, status.HTTP_403_FORBIDDEN)
-            self.assertEqual(res_patch.status_code, status.HTTP_403_FORBIDDEN)
-            self.assertEqual(res_del.status_code, status.HTTP_403_FORBIDDEN)
+            # Denied in has_permission, before the object is looked up.
+            with self.subTest(endpoint=key), self.assertNumQueries(0):
+                for method in (
+                    self.client.put, self.client.patch, self.client.delete
+                ):
+                    res = method(url, {})
+                    self.assertEqual(
+                        res.status_code,
+                        status.HTTP_403_FORBIDDEN
+                    )
+
+
+class JourneyFilterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        train_type = TrainType.objects.create(name="TestType")
+        stations = sample_stations(8)
+        trains = Train.objects.bulk_create(
+            [
+                sample_train(train_type=train_type, commit=False),
+                sample_train(train_type=train_type, commit=False),
+                sample_train(
+                    name="Test", train_type=train_type, commit=False
+                ),
+                sample_train(train_type=train_type, commit=False),
+            ]
+        )
+        routes = Route.objects.bulk_create(
+            [
+                sample_route(
+                    source=source, destination=destination, commit=False
+                )
+                for source, destination in zip(stations[::2], stations[1::2])
+            ]
+        )
+        cls.route = routes[1]
+        cls.train = trains[1]
+        cls.next_week_route = routes[2]
+
+        now = timezone.now()
+        cls.tomorrow = now + timedelta(days=1)
+        next_week = now + timedelta(days=7)
+        yesterday = now - timedelta(days=1)
+        (
+            cls.journey_soon,
+            cls.journey_tomorrow,
+            cls.journey_next_week,
+            cls.journey_expired,
+        ) = Journey.objects.bulk_create(
+            [
+                sample_journey(
+                    route=route,
+                    train=train,
+                    departure_time=departure_time,
+                    arrival_time=departure_time + timedelta(hours=1),
+                    commit=False,
+                )
+                for route, train, departure_time in zip(
+                    routes,
+                    trains,
+                    (
+                        now + timedelta(minutes=1),
+                        cls.tomorrow,
+                        next_week,
+                        yesterday,
+                    ),
+                )
+            ]
+        )
+
+    def journey_ids(self, **params) -> list[int]:
+        res = self.client.get(LIST_URLS["journey"], params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in res.data["results"]]
+
+    def test_journey_list(self):
+        first_journey = Journey.objects.filter(
+            departure_time__gte=timezone.now()
+        ).select_related(
+            "train", "route__source", "route__destination"
+        ).annotate(
+            available_tickets=F("train__capacity") - F("tickets_sold")
+        ).order_by("departure_time").first()
+        with self.assertNumQueries(0):
+            expected = JourneyListSerializer(first_journey).data
+        res = self.client.get(LIST_URLS["journey"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in res.data["results"]]
+        self.assertIn(self.journey_soon.id, ids)
+        self.assertIn(self.journey_tomorrow.id, ids)
+        self.assertIn(self.journey_next_week.id, ids)
+        self.assertNotIn(self.journey_expired.id, ids)
+        self.assertIn(expected, res.data["results"])
+
+    def test_journey_list_query_count_is_constant(self):
+        url = LIST_URLS["journey"]
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(url)
+        departure_time = timezone.now() + timedelta(hours=2)
+        Journey.objects.bulk_create(
+            [
+                sample_journey(
+                    route=self.route,
+                    train=self.train,
+                    departure_time=departure_time,
+                    arrival_time=departure_time + timedelta(hours=1),
+                    commit=False,
+                )
+                for _ in range(10)
+            ]
+        )
+        with self.assertNumQueries(len(before)):
+            res = self.client.get(url)
+        self.assertEqual(len(res.data["results"]), 10)
+
+    def test_filter_date(self):
+        ids = self.journey_ids(date=str(self.tomorrow.date()))
+        self.assertIn(self.journey_tomorrow.id, ids)
+        self.assertIn(self.journey_next_week.id, ids)
+        self.assertNotIn(self.journey_soon.id, ids)
+
+    def test_start_of_day_follows_active_timezone(self):
+        utc = start_of_day("2026-01-01")
+        with timezone.override("Europe/Kyiv"):
+            kyiv = start_of_day("2026-01-01")
+        self.assertEqual(utc - kyiv, timedelta(hours=2))
+
+    def test_filter_invalid_date(self):
+        for date in ("tomorrow", "2025-13-45"):
+            with self.subTest(date=date):
+                res = self.client.get(LIST_URLS["journey"], {"date": date})
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn("date", res.data)
+
+    def test_filter_destination(self):
+        ids = self.journey_ids(
+            destination=self.next_week_route.destination.name
+        )
+        self.assertIn(self.journey_next_week.id, ids)
+        self.assertNotIn(self.journey_soon.id, ids)
+
+    def test_filter_station_ids(self):
+        ids = self.journey_ids(
+            source_id=self.route.source_id,
+            destination_id=self.route.destination_id,
+        )
+        self.assertEqual(ids, [self.journey_tomorrow.id])
+
+        for value in ("Dublin", "²"):
+            with self.subTest(source_id=value):
+                res = self.client.get(
+                    LIST_URLS["journey"], {"source_id": value}
+                )
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+    def test_filter_source(self):
+        ids = self.journey_ids(source=self.route.source.name)
+        self.assertIn(self.journey_tomorrow.id, ids)
+        self.assertNotIn(self.journey_next_week.id, ids)
 
 
 class AdminRailwayTests(BaseRailwayTest):
-    def setUp(self):
-        super().setUp()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create(
             email="test.user@example.ie",
-            password="password.test.user",
+            password=UNUSABLE_PASSWORD,
             is_staff=True,
         )
-        self.client.force_authenticate(user=self.user)
+
+    def test_admin_reference_lists_not_modified(self):
+        for endpoint in ["station", "route", "traintype"]:
+            with self.subTest(endpoint=endpoint):
+                res = self.client.get(LIST_URLS[endpoint])
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                res = self.client.get(
+                    LIST_URLS[endpoint], HTTP_IF_NONE_MATCH=res["ETag"]
+                )
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_304_NOT_MODIFIED
+                )
 
     def test_admin_create_success(self):
         scenarious = [
@@ -448,8 +735,9 @@ class AdminRailwayTests(BaseRailwayTest):
             ("traintype", {"name": "NewType"}),
         ]
         for endpoint, data in scenarious:
-            res = self.client.post(reverse(f"railway:{endpoint}-list"), data)
-            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            with self.subTest(endpoint=endpoint):
+                res = self.client.post(LIST_URLS[endpoint], data)
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
     def test_admin_route_create_success(self):
         payload = {
@@ -458,27 +746,29 @@ class AdminRailwayTests(BaseRailwayTest):
             "distance": 10,
         }
         res = self.client.post(
-            reverse("railway:route-list"),
+            LIST_URLS["route"],
             payload,
             format="json"
         )
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
     def test_admin_journey_create_success(self):
+        now = timezone.now()
         payload = {
             "route": self.route.id,
             "train": self.train.id,
-            "departure_time": timezone.now() + timedelta(minutes=1),
-            "arrival_time": timezone.now() + timedelta(hours=1),
+            "departure_time": now + timedelta(minutes=1),
+            "arrival_time": now + timedelta(hours=1),
         }
         res = self.client.post(
-            reverse("railway:journey-list"),
+            LIST_URLS["journey"],
             payload,
             format="json"
         )
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
     def test_admin_update_delete_success(self):
+        now = timezone.now()
         scenarios = {
             "station":
                 lambda: (
@@ -497,25 +787,24 @@ class AdminRailwayTests(BaseRailwayTest):
                 ),
             "train":
                 lambda: (
-                    sample_train().id,
+                    sample_train(train_type=self.traintype).id,
                     {"name": "UpdateTrain"},
                     {"name": "Patch Train"}
                 ),
             "journey":
                 lambda: (
-                    sample_journey().id,
-                    {"departure_time": timezone.now() + timedelta(seconds=1)},
-                    {"departure_time": timezone.now() + timedelta(days=1)}
+                    sample_journey(route=self.route, train=self.train).id,
+                    {"departure_time": now + timedelta(seconds=1)},
+                    {"departure_time": now + timedelta(days=1)}
                 ),
         }
         for key, data_factory in scenarios.items():
-            instance_id, put_payload, patch_payload = data_factory()
-            url = detail_url(key, instance_id)
+            with self.subTest(endpoint=key):
+                instance_id, put_payload, patch_payload = data_factory()
+                url = detail_url(key, instance_id)
 
-            res_patch = self.client.patch(url, patch_payload, format="json")
-            self.assertEqual(res_patch.status_code, status.HTTP_200_OK,
-                             f"{key} PATCH error")
+                res = self.client.patch(url, patch_payload, format="json")
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-            res_del = self.client.delete(url)
-            self.assertEqual(res_del.status_code, status.HTTP_204_NO_CONTENT,
-                             f"{key} DELETE error")
+                res = self.client.delete(url)
+                self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
@@ -1,7 +1,20 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Type
 
-from django.db.models import F, Count, QuerySet
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import (
+    F,
+    Field,
+    Func,
+    QuerySet,
+    Prefetch,
+    Q,
+    TextField,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Concat
 from django.http import (
     HttpResponse,
     HttpRequest
@@ -13,14 +26,16 @@ from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter
 )
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAdminUser
 )
 from rest_framework.response import Response
 
+from railway.caching import cache_list_response
 from railway.models import (
     Station,
     Journey,
@@ -57,68 +72,164 @@ from railway.serializers import (
 )
 
 
+datetime_field = serializers.DateTimeField()
+
+
+# json rather than jsonb keeps each object's keys in the order given;
+# psycopg already decodes json values, so no JSONField conversion.
+class JSONAgg(JSONBAgg):
+    function = "JSON_AGG"
+    output_field = Field()
+
+
+class JSONBuildObject(Func):
+    function = "JSON_BUILD_OBJECT"
+    output_field = Field()
+
+    def __init__(self, **fields):
+        expressions = []
+        for key, value in fields.items():
+            expressions.extend((Cast(Value(key), TextField()), value))
+        super().__init__(*expressions)
+
+
+# Looks up the action's serializer, defaulting to serializer_class. Kept
+# as a comment: drf-spectacular would publish a docstring here as every
+# operation's description.
+class ActionSerializerMixin:
+    serializer_classes: dict[str, Type[serializers.BaseSerializer]] = {}
+
+    def get_serializer_class(self) -> Type[serializers.BaseSerializer]:
+        return self.serializer_classes.get(
+            self.action, self.serializer_class
+        )
+
+
+@lru_cache(maxsize=1024)
+def cached_parse_date(value: str) -> date | None:
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def start_of_day(value: str) -> datetime | None:
+    # Made aware per call, in whichever timezone is active for the request.
+    day = cached_parse_date(value)
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def station_id(param: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({param: "Enter a station id, e.g. '42'."})
+
+
 # Create your views here.
-class StationViewSet(viewsets.ModelViewSet):
+class StationViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
     pagination_class = ListsPagination
     permission_classes = (AllowAnyListOnlyUserReadOnlyAdminAll,)
 
-    def get_serializer_class(self) -> Type[
-        StationListSerializer | StationRetrieveSerializer | StationSerializer
-    ]:
-        if self.action == "list":
-            return StationListSerializer
-        elif self.action == "retrieve":
-            return StationRetrieveSerializer
-        return StationSerializer
+    serializer_classes = {
+        "list": StationListSerializer,
+        "retrieve": StationRetrieveSerializer,
+    }
+
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset.values("id", "name"))
+        return self.get_paginated_response(page)
+
+    def get_queryset(self) -> QuerySet:
+        queryset = self.queryset
+        if self.action == "retrieve":
+            now = timezone.now()
+            available_tickets = F("train__capacity") - F("tickets_sold")
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "outgoing_routes__journeys",
+                    queryset=Journey.objects.filter(arrival_time__gte=now)
+                    .select_related("route__destination")
+                    .annotate(available_tickets=available_tickets),
+                    to_attr="upcoming_out",
+                ),
+                Prefetch(
+                    "incoming_routes__journeys",
+                    queryset=Journey.objects.filter(departure_time__gte=now)
+                    .select_related("route__source")
+                    .annotate(available_tickets=available_tickets),
+                    to_attr="upcoming_in",
+                ),
+            )
+        return queryset
 
 
-class JourneyViewSet(viewsets.ModelViewSet):
+class JourneyViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Journey.objects.all()
     serializer_class = JourneySerializer
     ordering_fields = ("departure_time",)
     pagination_class = OrdersAndJourneysPagination
     permission_classes = (AllowAnyListOnlyUserReadOnlyAdminAll,)
 
+    serializer_classes = {
+        "list": JourneyListSerializer,
+        "retrieve": JourneyRetrieveSerializer,
+    }
+
     def get_queryset(self) -> QuerySet:
         queryset = self.queryset.select_related(
-            "train", "route", "route__destination", "route__source"
-        ).prefetch_related("crew")
-        source = self.request.query_params.get("source", None)
-        destination = self.request.query_params.get("destination", None)
-        date = self.request.query_params.get("date", None)
+            "train", "route__source", "route__destination"
+        )
+        query_params = self.request.query_params
+        source = query_params.get("source")
+        destination = query_params.get("destination")
+        date = query_params.get("date")
+        source_id = query_params.get("source_id")
+        destination_id = query_params.get("destination_id")
+        filters = Q()
         if self.action in ("list", "retrieve"):
             queryset = queryset.annotate(
-                available_tickets=(
-                    F("train__cargo_num") * F("train__places_in_cargo")
-                    - Count("tickets")
-                )
+                available_tickets=F("train__capacity") - F("tickets_sold")
             )
         if self.action == "list":
-            queryset = queryset.filter(departure_time__gte=timezone.now())
+            filters &= Q(departure_time__gte=timezone.now())
+        elif self.action == "retrieve":
+            queryset = queryset.defer("train__image").prefetch_related(
+                Prefetch(
+                    "crew",
+                    queryset=Crew.objects.only(
+                        "id", "first_name", "last_name", "position"
+                    ),
+                )
+            )
         if source:
-            queryset = queryset.filter(route__source__name__icontains=source)
+            filters &= Q(route__source__name__icontains=source)
         if destination:
-            queryset = queryset.filter(
-                route__destination__name__icontains=destination
+            filters &= Q(route__destination__name__icontains=destination)
+        if source_id:
+            filters &= Q(route__source_id=station_id("source_id", source_id))
+        if destination_id:
+            filters &= Q(
+                route__destination_id=station_id(
+                    "destination_id", destination_id
+                )
             )
         if date:
-            aware_date = timezone.make_aware(
-                datetime.combine(parse_date(date), datetime.min.time())
-            )
-            queryset = queryset.filter(departure_time__gte=aware_date)
-
-        return queryset.order_by("departure_time")
+            departure_from = start_of_day(date)
+            if departure_from is None:
+                raise ValidationError(
+                    {"date": "Enter a valid date, e.g. '2025-11-28'."}
+                )
+            filters &= Q(departure_time__gte=departure_from)
 
-    def get_serializer_class(self) -> Type[
-        JourneyListSerializer | JourneyRetrieveSerializer | JourneySerializer
-    ]:
-        if self.action == "list":
-            return JourneyListSerializer
-        elif self.action == "retrieve":
-            return JourneyRetrieveSerializer
-        return JourneySerializer
+        # Journey.Meta.ordering already sorts by departure_time.
+        return queryset.filter(filters)
 
     @extend_schema(
         parameters=[
@@ -136,6 +247,20 @@ class JourneyViewSet(viewsets.ModelViewSet):
                 "(ex. '?destination=Kilkenny')",
                 required=False,
             ),
+            OpenApiParameter(
+                "source_id",
+                type=OpenApiTypes.INT,
+                description="Filtering journeys by source station id "
+                            "(ex. '?source_id=1')",
+                required=False,
+            ),
+            OpenApiParameter(
+                "destination_id",
+                type=OpenApiTypes.INT,
+                description="Filtering journeys by destination station id "
+                            "(ex. '?destination_id=2')",
+                required=False,
+            ),
             OpenApiParameter(
                 "date",
                 type=OpenApiTypes.DATE,
@@ -146,55 +271,124 @@ class JourneyViewSet(viewsets.ModelViewSet):
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(
+            queryset.values_list(
+                "id",
+                "route__source__name",
+                "route__destination__name",
+                "train__name",
+                "departure_time",
+                "arrival_time",
+                "available_tickets",
+            )
+        )
+        return self.get_paginated_response(
+            [
+                {
+                    "id": journey_id,
+                    # Same string as Route.__str__.
+                    "route": f"{source} -> {destination}",
+                    "train": train,
+                    "departure_time": datetime_field.to_representation(
+                        departure_time
+                    ),
+                    "arrival_time": datetime_field.to_representation(
+                        arrival_time
+                    ),
+                    "available_tickets": available_tickets,
+                }
+                for (
+                    journey_id,
+                    source,
+                    destination,
+                    train,
+                    departure_time,
+                    arrival_time,
+                    available_tickets,
+                ) in page
+            ]
+        )
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Route.objects.all()
     serializer_class = RouteSerializer
     pagination_class = ListsPagination
     permission_classes = (AllowAnyListOnlyUserReadOnlyAdminAll,)
 
+    serializer_classes = {
+        "list": RouteListSerializer,
+        "retrieve": RouteRetrieveSerializer,
+    }
+
     def get_queryset(self) -> QuerySet:
         queryset = self.queryset
         if self.action in ("list", "retrieve"):
             queryset = queryset.select_related("source", "destination")
         return queryset
 
-    def get_serializer_class(self) -> Type[
-        RouteListSerializer | RouteSerializer | RouteRetrieveSerializer
-    ]:
-        if self.action == "list":
-            return RouteListSerializer
-        elif self.action == "retrieve":
-            return RouteRetrieveSerializer
-        return RouteSerializer
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        context["now"] = timezone.now()
+        return context
 
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(
+            queryset.values_list(
+                "id", "source__name", "destination__name", "distance"
+            )
+        )
+        return self.get_paginated_response(
+            [
+                {
+                    "id": route_id,
+                    "source": source,
+                    "destination": destination,
+                    "distance": distance,
+                }
+                for route_id, source, destination, distance in page
+            ]
+        )
 
-class OrderViewSet(viewsets.ModelViewSet):
+
+class OrderViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
     pagination_class = OrdersAndJourneysPagination
 
+    serializer_classes = {
+        "list": OrderListSerializer,
+        "retrieve": OrderListSerializer,
+    }
+
     def get_queryset(self) -> QuerySet:
-        queryset = self.queryset.filter(user=self.request.user)
+        user = self.request.user
+        if not user.is_authenticated:
+            return self.queryset.none()
+        queryset = self.queryset.filter(user=user)
         if self.action in ("list", "retrieve"):
-            queryset = queryset.prefetch_related(
-                "tickets",
-                "tickets__journey",
-                "tickets__journey__route__source",
-                "tickets__journey__route__destination",
-            )
+            queryset = queryset.only("id", "created_at").annotate(
+                tickets_json=JSONAgg(
+                    JSONBuildObject(
+                        cargo="tickets__cargo",
+                        seat="tickets__seat",
+                        journey=Concat(
+                            "tickets__journey__route__source__name",
+                            Value(" -> "),
+                            "tickets__journey__route__destination__name",
+                        ),
+                    ),
+                    filter=Q(tickets__isnull=False),
+                    order_by="tickets__id",
+                    default=RawSQL("'[]'::json", (), output_field=Field()),
+                )
+            ).order_by("-created_at")  # GROUP BY drops Meta.ordering
         return queryset
 
-    def get_serializer_class(self) -> Type[
-        OrderListSerializer | OrderSerializer
-    ]:
-        if self.action in ("list", "retrieve"):
-            return OrderListSerializer
-        return OrderSerializer
-
     def perform_create(
         self,
         serializer: Type[OrderSerializer | OrderListSerializer]
@@ -202,31 +396,33 @@ class OrderViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TrainViewSet(viewsets.ModelViewSet):
+class TrainViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Train.objects.all()
     serializer_class = TrainSerializer
     permission_classes = (AllowAnyListOnlyUserReadOnlyAdminAll,)
 
-    def get_serializer_class(
-        self,
-    ) -> Type[
-        TrainListSerializer
-        | TrainRetrieveSerializer
-        | TrainSerializer
-        | TrainImageSerializer
-    ]:
-        if self.action == "list":
-            return TrainListSerializer
-        elif self.action == "retrieve":
-            return TrainRetrieveSerializer
-        elif self.action == "upload_image":
-            return TrainImageSerializer
-        return TrainSerializer
+    serializer_classes = {
+        "list": TrainListSerializer,
+        "retrieve": TrainRetrieveSerializer,
+        "upload_image": TrainImageSerializer,
+    }
+
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self) -> QuerySet:
         queryset = self.queryset
         if self.action in ("list", "retrieve"):
             queryset = queryset.select_related("train_type")
+        if self.action == "list":
+            queryset = queryset.only(
+                "id",
+                "name",
+                "cargo_num",
+                "places_in_cargo",
+                "train_type__name",
+            )
         return queryset
 
     @action(
@@ -235,7 +431,7 @@ class TrainViewSet(viewsets.ModelViewSet):
         url_path="upload-image",
     )
     def upload_image(self, request: HttpRequest, pk: int) -> HttpResponse:
-        train = Train.objects.get(pk=pk)
+        train = self.get_object()
         serializer = self.get_serializer(train, data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -250,13 +446,16 @@ class CrewViewSet(viewsets.ModelViewSet):
     pagination_class = ListsPagination
 
 
-class TrainTypeViewSet(viewsets.ModelViewSet):
+class TrainTypeViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = TrainType.objects.all()
     serializer_class = TrainTypeSerializer
     permission_classes = (IsAdminUser,)
     pagination_class = ListsPagination
 
-    def get_serializer_class(self):
-        if self.action == "retrieve":
-            return TrainTypeRetrieveSerializer
-        return TrainTypeSerializer
+    serializer_classes = {
+        "retrieve": TrainTypeRetrieveSerializer,
+    }
+
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)